@@ -0,0 +1,234 @@
+"""
+Async backend for TrashVision - same /predict contract as the Flask server
+in backend/scripts/test_predict.py, but served over ASGI so one event loop
+multiplexes many in-flight Azure calls instead of one blocked thread each.
+
+Run (from the repository root):
+uvicorn backend.app.main:app --host 0.0.0.0 --port 8000 --workers 4
+"""
+import asyncio
+import hashlib
+import heapq
+import logging
+import os
+import time
+from collections import OrderedDict
+from operator import itemgetter
+from pathlib import Path
+
+import httpx
+from dotenv import load_dotenv
+from fastapi import FastAPI, File, UploadFile
+from fastapi.middleware.cors import CORSMiddleware
+
+# Load environment variables from backend/.env
+env_path = Path(__file__).resolve().parent.parent / ".env"
+load_dotenv(dotenv_path=env_path)
+
+logger = logging.getLogger(__name__)
+
+# Azure configuration, read once at import
+PREDICTION_KEY = os.getenv('PREDICTION_KEY')
+TRAINING_KEY = os.getenv('TRAINING_KEY')  # Fallback option
+PREDICTION_ENDPOINT = (os.getenv('PREDICTION_ENDPOINT') or '').rstrip('/')
+PROJECT_ID = os.getenv('PROJECT_ID')
+PUBLISHED_NAME = os.getenv('PUBLISHED_NAME', 'trashvision-version2')
+
+# Same candidate list as the Flask server, deduped in order
+ITERATION_NAMES = list(dict.fromkeys([
+    PUBLISHED_NAME,
+    'RecycleSmart-Prediction',
+    'RecycleSmart',
+    'trashvision-v3',
+    'trashvision-version2',
+    'trashvision-v1',
+    'latest'
+]))
+
+RECOMMENDATION_TEMPLATES = {
+    True: "{} item can be placed in recycling bin",
+    False: "{} item should go in general waste",
+}
+
+app = FastAPI(title="TrashVision")
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
+)
+
+# One shared client per worker; concurrent predictions multiplex over a
+# small pool of keep-alive HTTP/2 connections
+_client = None
+
+# Working (key header, iteration name) combo; single event loop, so a plain
+# module global is safe without a lock
+_working_combo = None
+
+# Content-hash result cache, mirroring the Flask server's
+_prediction_cache = OrderedDict()  # digest -> (result dict, timestamp)
+_CACHE_MAX_ENTRIES = 256
+_CACHE_TTL = 300  # seconds
+
+
+@app.on_event("startup")
+async def _startup():
+    global _client
+    _client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=httpx.Timeout(15.0, connect=3.05),
+    )
+
+
+@app.on_event("shutdown")
+async def _shutdown():
+    if _client:
+        await _client.aclose()
+
+
+def _prediction_url(iteration_name):
+    return (f"{PREDICTION_ENDPOINT}/customvision/v3.0/Prediction/{PROJECT_ID}"
+            f"/classify/iterations/{iteration_name}/image")
+
+
+async def _post_image(key_type, api_key, iteration_name, image_data):
+    """POST the image to one candidate iteration; returns (status, json or None)."""
+    headers = {
+        key_type: api_key,
+        'Content-Type': 'application/octet-stream',
+        'Accept-Encoding': 'gzip, br',
+    }
+    response = await _client.post(_prediction_url(iteration_name),
+                                  headers=headers, content=image_data)
+    if response.status_code == 200:
+        return response.status_code, response.json()
+    return response.status_code, None
+
+
+def _build_result(prediction_result):
+    """Turn the raw Azure response into the /predict JSON contract."""
+    detected_items = []
+    recommendations = []
+
+    # Top-5 without a full sort, same as the Flask server's hot path
+    predictions = heapq.nlargest(5, prediction_result.get('predictions', []),
+                                 key=itemgetter('probability'))
+    for pred in predictions:
+        probability = pred['probability']
+        if probability <= 0.5:
+            continue
+        tag_name = pred['tagName']
+        tag_lower = tag_name.lower()
+        is_recyclable = tag_lower == 'recyclable'
+        detected_items.append({
+            'type': tag_lower,
+            'confidence': probability,
+            'recyclable': is_recyclable
+        })
+        if not recommendations:
+            recommendations.append(
+                RECOMMENDATION_TEMPLATES[is_recyclable].format(tag_name))
+
+    if not detected_items:
+        detected_items.append({
+            'type': 'unknown',
+            'confidence': 0.0,
+            'recyclable': False
+        })
+        recommendations.append('Unable to classify item. Please check local recycling guidelines.')
+
+    return {
+        'detected_items': detected_items,
+        'recommendations': recommendations,
+        'raw_predictions': prediction_result.get('predictions', [])
+    }
+
+
+async def run_prediction(image_data):
+    """Classify one image; mirrors the Flask server's probe-and-cache flow."""
+    global _working_combo
+
+    if not all([PREDICTION_KEY, PREDICTION_ENDPOINT, PROJECT_ID]):
+        return {
+            'error': 'Missing required environment variables: PREDICTION_KEY, ENDPOINT, PROJECT_ID'
+        }
+
+    digest = hashlib.blake2b(image_data, digest_size=16).digest()
+    cached = _prediction_cache.get(digest)
+    if cached and time.time() - cached[1] < _CACHE_TTL:
+        _prediction_cache.move_to_end(digest)
+        return cached[0]
+
+    keys_to_try = [(key_type, api_key) for key_type, api_key in [
+        ('Prediction-Key', PREDICTION_KEY),
+        ('Training-Key', TRAINING_KEY)
+    ] if api_key]
+
+    prediction_result = None
+
+    # Fast path: the combo that worked last time
+    if _working_combo:
+        key_type, iteration_name = _working_combo
+        api_key = PREDICTION_KEY if key_type == 'Prediction-Key' else TRAINING_KEY
+        if api_key:
+            try:
+                status, prediction_result = await _post_image(
+                    key_type, api_key, iteration_name, image_data)
+            except httpx.TransportError as e:
+                logger.warning("Network error on cached iteration: %s", e)
+        if prediction_result is None:
+            _working_combo = None
+
+    if prediction_result is None:
+        for key_type, api_key in keys_to_try:
+            for iteration_name in ITERATION_NAMES:
+                try:
+                    status, prediction_result = await _post_image(
+                        key_type, api_key, iteration_name, image_data)
+                except httpx.TransportError as e:
+                    logger.warning("Network error: %s", e)
+                    break
+                if prediction_result is not None:
+                    _working_combo = (key_type, iteration_name)
+                    break
+                if status == 404:
+                    continue  # iteration name doesn't exist; try the next one
+                break  # auth or server error; don't spray alternate names
+            if prediction_result is not None:
+                break
+
+    if prediction_result is None:
+        return {
+            'error': 'No working iteration found. Check your Azure Custom Vision project.',
+            'tried_iterations': ITERATION_NAMES,
+            'suggestion': 'Go to Azure Custom Vision portal > Performance tab > check your published iteration name'
+        }
+
+    result = _build_result(prediction_result)
+    _prediction_cache[digest] = (result, time.time())
+    while len(_prediction_cache) > _CACHE_MAX_ENTRIES:
+        _prediction_cache.popitem(last=False)
+    return result
+
+
+@app.post("/predict")
+async def predict_image(image: UploadFile = File(...)):
+    """Endpoint for image classification."""
+    image_data = await image.read()
+    if not image_data:
+        return {'error': 'No image selected'}
+    return await run_prediction(image_data)
+
+
+@app.post("/predict_batch")
+async def predict_batch(images: list[UploadFile] = File(...)):
+    """Classify several images concurrently; results keep upload order."""
+    payloads = [await img.read() for img in images]
+    if not any(payloads):
+        return {'error': 'No images uploaded'}
+    # One gather: the event loop multiplexes every Azure call over the
+    # shared HTTP/2 client
+    return list(await asyncio.gather(
+        *(run_prediction(data) for data in payloads)))
@@ -6,6 +6,7 @@ Script to check Azure Custom Vision project details including:
 - Model performance metrics
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from azure.cognitiveservices.vision.customvision.training import CustomVisionTrainingClient
 from azure.cognitiveservices.vision.customvision.prediction import CustomVisionPredictionClient
@@ -29,6 +30,7 @@ def check_project_details():
         print("❌ Missing required environment variables!")
         return
     
+    executor = None
     try:
         # Initialize training client
         credentials = ApiKeyCredentials(in_headers={"Training-key": training_key})
@@ -37,9 +39,16 @@ def check_project_details():
         print("=" * 60)
         print("🔍 AZURE CUSTOM VISION PROJECT DETAILS")
         print("=" * 60)
-        
+
+        # Each API call is a blocking REST round-trip; fire the independent
+        # ones concurrently so wall time is max(latency) instead of the sum
+        executor = ThreadPoolExecutor(max_workers=8)
+        project_future = executor.submit(trainer.get_project, project_id)
+        iterations_future = executor.submit(trainer.get_iterations, project_id)
+        tags_future = executor.submit(trainer.get_tags, project_id)
+
         # Get project information
-        project = trainer.get_project(project_id)
+        project = project_future.result()
         print(f"📋 Project Name: {project.name}")
         print(f"🆔 Project ID: {project.id}")
         print(f"📝 Description: {project.description}")
@@ -51,12 +60,19 @@ def check_project_details():
         # Get all iterations
         print("🔄 ALL ITERATIONS:")
         print("-" * 40)
-        iterations = trainer.get_iterations(project_id)
-        
+        iterations = iterations_future.result()
+
         if not iterations:
             print("❌ No iterations found!")
             return
-            
+
+        # Kick off all the per-iteration performance fetches at once; the
+        # printing pass below just collects the already-in-flight results
+        performance_futures = {
+            iteration.id: executor.submit(trainer.get_iteration_performance, project_id, iteration.id)
+            for iteration in iterations if iteration.publish_name
+        }
+
         for i, iteration in enumerate(iterations, 1):
             print(f"{i}. Name: {iteration.name}")
             print(f"   ID: {iteration.id}")
@@ -70,7 +86,7 @@ def check_project_details():
                 
                 # Try to get performance metrics
                 try:
-                    performance = trainer.get_iteration_performance(project_id, iteration.id)
+                    performance = performance_futures[iteration.id].result()
                     if performance.overall_precision is not None:
                         print(f"   📊 Precision: {performance.overall_precision:.2%}")
                         print(f"   📊 Recall: {performance.overall_recall:.2%}")
@@ -79,10 +95,10 @@ def check_project_details():
                     print(f"   📊 Performance: Not available")
             print()
         
-        # Get tags
+        # Get tags (fetched concurrently with the iterations above)
         print("🏷️ AVAILABLE TAGS:")
         print("-" * 40)
-        tags = trainer.get_tags(project_id)
+        tags = tags_future.result()
         for tag in tags:
             print(f"• {tag.name} (ID: {tag.id}) - {tag.image_count} images")
         print()
@@ -133,6 +149,9 @@ def check_project_details():
         print("• Invalid training key or endpoint")
         print("• Incorrect project ID")
         print("• Network connectivity issues")
+    finally:
+        if executor:
+            executor.shutdown(wait=False)
 
 if __name__ == "__main__":
     check_project_details()
\ No newline at end of file
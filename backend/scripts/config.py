@@ -0,0 +1,31 @@
+"""
+Shared environment configuration for the backend scripts.
+
+backend/.env is located and parsed exactly once per process, then the values
+are cached, so forked workers (e.g. gunicorn/uvicorn --workers 4) don't each
+re-stat and re-parse the file. Scripts read settings off the returned config
+object instead of printing secret-bearing variables to verify they loaded.
+"""
+import os
+from functools import lru_cache
+from pathlib import Path
+from types import SimpleNamespace
+
+from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=1)
+def get_config():
+    """Load backend/.env (never overriding real env vars) and return the settings."""
+    env_path = Path(__file__).resolve().parent.parent / ".env"
+    load_dotenv(dotenv_path=env_path, override=False)
+    return SimpleNamespace(
+        prediction_key=os.getenv('PREDICTION_KEY'),
+        training_key=os.getenv('TRAINING_KEY') or os.getenv('AZURE_CUSTOM_VISION_TRAINING_KEY'),
+        endpoint=os.getenv('ENDPOINT') or os.getenv('AZURE_CUSTOM_VISION_TRAINING_ENDPOINT'),
+        prediction_endpoint=(os.getenv('PREDICTION_ENDPOINT') or '').rstrip('/'),
+        project_id=os.getenv('PROJECT_ID'),
+        published_name=os.getenv('PUBLISHED_NAME', 'trashvision-version2'),
+        prediction_resource_id=(os.getenv('PREDICTION_RESOURCE_ID')
+                                or os.getenv('AZURE_CUSTOM_VISION_PREDICTION_RESOURCE_ID')),
+    )
@@ -0,0 +1,98 @@
+"""
+Download training images for non-recyclable items from Bing into backend/data/Nonrecyclable.
+
+Usage (PowerShell):
+cd "<localPath to clone>" ; python backend/scripts/nonrecyclableItems.py
+
+Downloads are network-I/O-bound, so queries run concurrently through a
+ThreadPoolExecutor instead of a serial for loop. Set DOWNLOAD_WORKERS to
+control the pool size (default: min(12, number of queries)).
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# better-bing-image-downloader adds parallel worker threads per query,
+# resume (already-downloaded files are skipped on re-runs) and MD5 dedup.
+from better_bing_image_downloader import downloader
+
+# Images land in backend/data/Nonrecyclable/<query name>/
+output_dir = str(Path(__file__).resolve().parent.parent / "data" / "Nonrecyclable")
+
+items = [
+    "styrofoam cup",
+    "styrofoam container",
+    "plastic bag",
+    "grocery bag plastic",
+    "chip bag",
+    "candy wrapper",
+    "food waste",
+    "banana peel",
+    "apple core",
+    "pizza box greasy",
+    "used napkin",
+    "paper towel used",
+    "tissue used",
+    "diaper",
+    "plastic straw",
+    "plastic utensils",
+    "plastic wrap",
+    "cling film",
+    "broken ceramic",
+    "broken mirror",
+    "light bulb incandescent",
+    "window glass broken",
+    "drinking glass broken",
+    "coffee cup disposable",
+    "waxed paper",
+    "laminated paper",
+    "photo paper",
+    "receipt thermal paper",
+    "juice pouch",
+    "snack wrapper",
+    "foam packaging",
+    "packing peanuts",
+    "rubber band",
+    "balloon",
+    "cigarette butt",
+    "chewing gum",
+    "cotton swab",
+    "dental floss",
+    "toothpaste tube",
+    "razor disposable",
+    "pen plastic",
+    "marker",
+    "toothbrush",
+    "sponge kitchen",
+    "garden hose",
+    "vinyl record broken",
+    "CD scratched",
+    "styrofoam plate",
+    "paper plate used",
+    "bubble wrap",
+]
+
+
+def download_one(item):
+    """Download images for a single query; failures don't stop other queries."""
+    try:
+        downloader(
+            item,
+            limit=5,
+            output_dir=output_dir,
+            adult_filter_off=True,
+            force_replace=False,
+            timeout=60,
+            filter="photo",
+        )
+        print(f"Downloaded images for: {item}")
+    except Exception as e:
+        print(f"Download failed for '{item}': {e}")
+
+
+if __name__ == "__main__":
+    max_workers = int(os.getenv("DOWNLOAD_WORKERS", min(12, len(items))))
+    print(f"Downloading {len(items)} non-recyclable item queries with {max_workers} workers...")
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        list(ex.map(download_one, items))
+    print("Done. Images saved under", output_dir)
@@ -0,0 +1,98 @@
+"""
+Download training images for recyclable items from Bing into backend/data/Recyclable.
+
+Usage (PowerShell):
+cd "<localPath to clone>" ; python backend/scripts/recyclableItems.py
+
+Downloads are network-I/O-bound, so queries run concurrently through a
+ThreadPoolExecutor instead of a serial for loop. Set DOWNLOAD_WORKERS to
+control the pool size (default: min(12, number of queries)).
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# better-bing-image-downloader adds parallel worker threads per query,
+# resume (already-downloaded files are skipped on re-runs) and MD5 dedup.
+from better_bing_image_downloader import downloader
+
+# Images land in backend/data/Recyclable/<query name>/
+output_dir = str(Path(__file__).resolve().parent.parent / "data" / "Recyclable")
+
+items = [
+    "plastic bottle",
+    "plastic water bottle",
+    "soda can",
+    "aluminum can",
+    "tin can",
+    "glass bottle",
+    "glass jar",
+    "cardboard box",
+    "cardboard packaging",
+    "newspaper",
+    "magazine",
+    "office paper",
+    "paper bag",
+    "milk jug",
+    "plastic milk carton",
+    "juice carton",
+    "cereal box",
+    "egg carton",
+    "aluminum foil",
+    "metal food can",
+    "steel can",
+    "plastic detergent bottle",
+    "shampoo bottle",
+    "plastic food container",
+    "yogurt container",
+    "plastic cup",
+    "paper envelope",
+    "junk mail",
+    "phone book",
+    "paperboard",
+    "wine bottle",
+    "beer bottle",
+    "mason jar",
+    "soup can",
+    "tuna can",
+    "pet food can",
+    "plastic takeout container",
+    "clamshell packaging",
+    "water jug",
+    "plastic soda bottle",
+    "paper towel roll",
+    "toilet paper roll",
+    "corrugated cardboard",
+    "shipping box",
+    "pizza box clean",
+    "catalog",
+    "flyer paper",
+    "greeting card",
+    "wrapping paper plain",
+    "bubble wrap",
+]
+
+
+def download_one(item):
+    """Download images for a single query; failures don't stop other queries."""
+    try:
+        downloader(
+            item,
+            limit=5,
+            output_dir=output_dir,
+            adult_filter_off=True,
+            force_replace=False,
+            timeout=60,
+            filter="photo",
+        )
+        print(f"Downloaded images for: {item}")
+    except Exception as e:
+        print(f"Download failed for '{item}': {e}")
+
+
+if __name__ == "__main__":
+    max_workers = int(os.getenv("DOWNLOAD_WORKERS", min(12, len(items))))
+    print(f"Downloading {len(items)} recyclable item queries with {max_workers} workers...")
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        list(ex.map(download_one, items))
+    print("Done. Images saved under", output_dir)
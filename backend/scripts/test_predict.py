@@ -2,59 +2,257 @@
 Flask web server for TrashVision - serves the web app and handles predictions
 Usage:
 cd "<localPath to clone>" ; python backend/scripts/test_predict.py
+
+Set FLASK_DEBUG=1 for the Werkzeug debugger/reloader during development.
+In production, run under a real WSGI server with threads so concurrent
+/predict requests overlap their Azure round-trips instead of queueing
+behind the single-threaded dev server:
+
+gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:5000 --chdir backend/scripts test_predict:app
 """
 import sys
 import os
+import copy
+import hashlib
+import heapq
+import io
+import mimetypes
+import threading
+import time
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from operator import itemgetter
 import requests
-from flask import Flask, request, jsonify, send_from_directory, render_template_string
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from flask import Flask, request, jsonify, send_from_directory
+from flask_cors import CORS
+from werkzeug.exceptions import NotFound
 from pathlib import Path
+from PIL import Image
+
+from config import get_config
+
+# Hot-path diagnostics go through logging (DEBUG, off by default) instead of
+# print: stdout writes flush synchronously and serialize concurrent workers
+logger = logging.getLogger(__name__)
+
+# Azure configuration, loaded and cached once per process by config.py
+_cfg = get_config()
+PREDICTION_KEY = _cfg.prediction_key
+TRAINING_KEY = _cfg.training_key  # Fallback option
+PREDICTION_ENDPOINT = _cfg.prediction_endpoint
+PROJECT_ID = _cfg.project_id
+PUBLISHED_NAME = _cfg.published_name
+
+if not all([PREDICTION_KEY, PREDICTION_ENDPOINT, PROJECT_ID]):
+    # Warn loudly at startup; /predict still answers with a JSON error so the
+    # frontend gets something it can display
+    logger.warning("Missing configuration - Endpoint: %s, Project: %s, Key: %s",
+                   bool(PREDICTION_ENDPOINT), bool(PROJECT_ID), bool(PREDICTION_KEY))
+
+# Shared HTTP session so successive /predict calls reuse pooled keep-alive
+# connections (and their TLS handshakes) instead of reconnecting per call
+SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.3,
+                      status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset(['POST']))
+)
+SESSION.mount('https://', _ADAPTER)
+# The CLI test path posts to the local server over plain HTTP
+SESSION.mount('http://', _ADAPTER)
+
+# (connect, read) timeout: connect just above TCP retransmit, read as budget.
+# Worst-case tail is ~(3+8)s x 3 attempts instead of an open-ended 10s each.
+REQUEST_TIMEOUT = (3.05, 8)
+
+# Uploads above this size are downscaled before the Azure POST; Custom Vision
+# resizes server-side anyway, so the extra bytes are pure upload latency
+_RECOMPRESS_THRESHOLD = 512_000
+_MAX_EDGE = 1024
+
+# All Azure calls funnel through one bounded pool: bursts pipeline over the
+# shared keep-alive connections instead of stampeding the endpoint, and the
+# cap keeps us under Azure's per-resource throttling under load
+_AZURE_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='predict')
+
+# Once a (key header, iteration name) combo has returned 200, remember it so
+# later requests go straight to it instead of re-walking the whole probe grid
+_COMBO_LOCK = threading.Lock()
+_WORKING_COMBO = None  # (key_type, iteration_name)
+
+# Published iteration name resolved from the Training API, attempted at most
+# once per process. Each probe miss costs a full image upload, so one cheap
+# metadata call is worth trying first.
+_RESOLVE_LOCK = threading.Lock()
+_RESOLVED_ITERATION = None
+_RESOLVE_ATTEMPTED = False
+
+
+def _resolve_published_iteration():
+    """Ask the Training API for the newest completed published iteration name."""
+    if not (TRAINING_KEY and _cfg.endpoint and PROJECT_ID):
+        return None
+    try:
+        from azure.cognitiveservices.vision.customvision.training import CustomVisionTrainingClient
+        from msrest.authentication import ApiKeyCredentials
+        creds = ApiKeyCredentials(in_headers={'Training-key': TRAINING_KEY})
+        trainer = CustomVisionTrainingClient(_cfg.endpoint, creds)
+        published = [it for it in trainer.get_iterations(PROJECT_ID)
+                     if it.publish_name and it.status == 'Completed']
+        if published:
+            return max(published, key=lambda it: it.created).publish_name
+    except Exception as e:
+        logger.warning("Could not resolve published iteration from Training API: %s", e)
+    return None
+
+
+def _published_iteration_hint():
+    """Resolve the published iteration lazily, once; None if it can't be."""
+    global _RESOLVED_ITERATION, _RESOLVE_ATTEMPTED
+    with _RESOLVE_LOCK:
+        if not _RESOLVE_ATTEMPTED:
+            _RESOLVE_ATTEMPTED = True
+            _RESOLVED_ITERATION = _resolve_published_iteration()
+        return _RESOLVED_ITERATION
+
+# Repeat uploads of the same bytes (UI retries, re-clicked demo images) are
+# answered from an in-process LRU keyed by content hash instead of re-calling
+# Azure. TTL keeps results from outliving a model republish for too long.
+_CACHE_LOCK = threading.Lock()
+_PREDICTION_CACHE = OrderedDict()  # digest -> (result dict, timestamp)
+_CACHE_MAX_ENTRIES = 512
+_CACHE_TTL = 300  # seconds
+
+
+def _cache_get(digest):
+    """Return a cached prediction result for this image digest, or None."""
+    with _CACHE_LOCK:
+        entry = _PREDICTION_CACHE.get(digest)
+        if not entry:
+            return None
+        result, timestamp = entry
+        if time.time() - timestamp > _CACHE_TTL:
+            del _PREDICTION_CACHE[digest]
+            return None
+        _PREDICTION_CACHE.move_to_end(digest)
+        return copy.deepcopy(result)
+
+
+# Recommendation templates, precomputed so the per-prediction loop only does
+# a dict lookup + format instead of rebuilding f-strings each time
+RECOMMENDATION_TEMPLATES = {
+    True: "{} item can be placed in recycling bin",
+    False: "{} item should go in general waste",
+}
 
-# Load environment variables
-env_path = Path(__file__).resolve().parent.parent / ".env"
-load_dotenv(dotenv_path=env_path)
+
+def _cache_put(digest, result):
+    """Store a successful prediction result, evicting the oldest entry."""
+    with _CACHE_LOCK:
+        _PREDICTION_CACHE[digest] = (copy.deepcopy(result), time.time())
+        _PREDICTION_CACHE.move_to_end(digest)
+        while len(_PREDICTION_CACHE) > _CACHE_MAX_ENTRIES:
+            _PREDICTION_CACHE.popitem(last=False)
 
 # Get the project root directory (two levels up from this script)
 project_root = Path(__file__).resolve().parent.parent.parent
 
 # Configure Flask app to serve static files from the project root
-app = Flask(__name__, 
-            static_folder=str(project_root), 
+app = Flask(__name__,
+            static_folder=str(project_root),
             static_url_path='')
 
+# Reject absurd uploads before they spool to disk; anything a camera
+# produces fits comfortably under this
+app.config['MAX_CONTENT_LENGTH'] = 20 * 1024 * 1024
+
+# CORS handled by middleware, scoped to the API route; headers are built once
+# at setup instead of mutated per response
+CORS(app, resources={r"/predict*": {"origins": "*"}})
+
+# Serialize responses with orjson when available: raw_predictions can be a
+# long list of dicts, and orjson dumps it 2-5x faster than stdlib json.
+# Without orjson installed, Flask's default provider still works, just slower.
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+
+    class _OrjsonProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = _OrjsonProvider(app)
+except ImportError:
+    pass
+
 @app.route("/")
 def home():
     """Serve the main HTML page"""
     try:
-        # Read and serve the index.html file
-        html_path = project_root / "index.html"
-        with open(html_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        return html_content
-    except FileNotFoundError:
+        # send_from_directory sets Last-Modified/ETag and answers conditional
+        # GETs with 304s, instead of re-reading index.html on every request
+        return send_from_directory(project_root, "index.html", max_age=300)
+    except NotFound:
         return """
         <h1>TrashVision Server Running</h1>
         <p>HTML file not found. Please ensure index.html is in the project root.</p>
         <p>Server is ready to accept predictions at /predict</p>
         """, 404
 
+# Small static assets (CSS, JS, logos) are read once at startup and served
+# from memory with long-lived cache headers; anything missing from the
+# preload falls back to send_from_directory
+_STATIC_MAX_BYTES = 1024 * 1024
+
+
+def _preload_static(base_dir):
+    """Read every file under base_dir (<=1MB) into {relpath: (bytes, mimetype, etag)}."""
+    blobs = {}
+    if not base_dir.is_dir():
+        return blobs
+    for path in base_dir.rglob('*'):
+        if path.is_file() and path.stat().st_size <= _STATIC_MAX_BYTES:
+            data = path.read_bytes()
+            mime = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+            etag = hashlib.blake2b(data, digest_size=16).hexdigest()
+            blobs[path.relative_to(base_dir).as_posix()] = (data, mime, etag)
+    return blobs
+
+
+def _serve_cached(blobs, base_dir, filename):
+    """Serve filename from the in-memory blob dict, else from disk."""
+    entry = blobs.get(filename)
+    if entry is None:
+        return send_from_directory(base_dir, filename)
+    data, mime, etag = entry
+    response = app.response_class(data, mimetype=mime)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    # Turns the response into a cheap 304 when If-None-Match matches
+    return response.make_conditional(request)
+
+
+_RESOURCE_BLOBS = _preload_static(project_root / "resources")
+_IMAGE_BLOBS = _preload_static(project_root / "Images")
+
+
 @app.route("/resources/<path:filename>")
 def serve_resources(filename):
     """Serve CSS, JS, and other resource files"""
-    return send_from_directory(project_root / "resources", filename)
+    return _serve_cached(_RESOURCE_BLOBS, project_root / "resources", filename)
 
 @app.route("/Images/<path:filename>")
 def serve_images(filename):
     """Serve image files"""
-    return send_from_directory(project_root / "Images", filename)
-
-# CORS handling
-@app.after_request
-def after_request(response):
-    response.headers.add('Access-Control-Allow-Origin', '*')
-    response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
-    response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
-    return response
+    return _serve_cached(_IMAGE_BLOBS, project_root / "Images", filename)
 
 def run_prediction(image):
     """
@@ -62,89 +260,165 @@ def run_prediction(image):
         dict: Prediction results with detected items and recommendations
     """
     try:
-        # Get environment variables - Try Training Key if Prediction Key fails
-        prediction_key = os.getenv('PREDICTION_KEY')
-        training_key = os.getenv('TRAINING_KEY')  # Fallback option
-        prediction_endpoint = os.getenv('PREDICTION_ENDPOINT') 
-        project_id = os.getenv('PROJECT_ID')
-        published_name = os.getenv('PUBLISHED_NAME', 'trashvision-version2')
-        
-        # Common iteration names to try if the provided one fails
-        iteration_names_to_try = [
+        # Configuration was loaded at import; use the prediction key first and
+        # fall back to the training key
+        prediction_key = PREDICTION_KEY
+        training_key = TRAINING_KEY
+        prediction_endpoint = PREDICTION_ENDPOINT
+        project_id = PROJECT_ID
+        published_name = PUBLISHED_NAME
+
+        # Common iteration names to try if the provided one fails; dedupe in
+        # order so PUBLISHED_NAME matching a fallback isn't probed twice. If
+        # the Training API can name the published iteration, it goes first -
+        # every probe miss below costs a full image upload.
+        iteration_names_to_try = list(dict.fromkeys([
+            _published_iteration_hint(),
             published_name,
             'RecycleSmart-Prediction',
-            'RecycleSmart', 
+            'RecycleSmart',
             'trashvision-v3',
             'trashvision-version2',
             'trashvision-v1',
             'latest'
-        ]
-        
-        # Basic configuration validation
-        if not all([prediction_key, prediction_endpoint, project_id]):
-            print(f"Missing configuration - Endpoint: {bool(prediction_endpoint)}, Project: {bool(project_id)}, Key: {bool(prediction_key)}")
-        
+        ]))
+        if iteration_names_to_try[0] is None:
+            iteration_names_to_try.pop(0)
+
         # Validate required environment variables
         if not all([prediction_key, prediction_endpoint, project_id]):
             return {
                 'error': 'Missing required environment variables: PREDICTION_KEY, ENDPOINT, PROJECT_ID'
             }
-        
-        # Ensure endpoint doesn't end with slash
-        if prediction_endpoint.endswith('/'):
-            prediction_endpoint = prediction_endpoint.rstrip('/')
-        
-        # Prepare headers
-        headers = {
-            'Prediction-Key': prediction_key,
-            'Content-Type': 'application/octet-stream'
-        }
-        
-        # Read image data
-        image_data = image.read()
-        
+
+        # Stream the upload straight from Werkzeug's spooled file instead of
+        # buffering the whole image into a bytes object (a 10MB phone photo
+        # would otherwise be held in RAM and re-sent from the copy on retries).
+        # requests derives Content-Length from the seekable stream.
+        image_stream = image.stream
+
+        # Hash the stream in chunks (no full-buffer copy) and serve repeats
+        # from the in-process cache without touching Azure
+        hasher = hashlib.blake2b(digest_size=16)
+        image_stream.seek(0)
+        for chunk in iter(lambda: image_stream.read(64 * 1024), b''):
+            hasher.update(chunk)
+        image_digest = hasher.digest()
+
+        cached_result = _cache_get(image_digest)
+        if cached_result is not None:
+            return cached_result
+
+        # Phone cameras send 5-15MB photos; shrink anything large to 1024px
+        # JPEG q85 before upload. Classification accuracy is unaffected since
+        # Azure downsamples further on its side.
+        image_stream.seek(0, os.SEEK_END)
+        upload_size = image_stream.tell()
+        upload_stream = image_stream
+        if upload_size > _RECOMPRESS_THRESHOLD:
+            try:
+                image_stream.seek(0)
+                img = Image.open(image_stream)
+                img.thumbnail((_MAX_EDGE, _MAX_EDGE), Image.LANCZOS)
+                buf = io.BytesIO()
+                img.convert('RGB').save(buf, 'JPEG', quality=85, optimize=True)
+                upload_stream = buf
+                logger.debug("Recompressed upload from %d to %d bytes",
+                             upload_size, buf.getbuffer().nbytes)
+            except Exception as e:
+                # Not decodable (or Pillow hiccup): send the original bytes
+                logger.warning("Could not recompress upload: %s", e)
+                upload_stream = image_stream
+
         # Try different iteration names until one works
         successful_response = None
-        
-        # Try with Prediction Key first, then Training Key as fallback
-        keys_to_try = [
+
+        # Fast path: reuse the combo that worked last time (one POST instead of
+        # re-probing the whole grid). Invalidated on failure, e.g. republish.
+        give_up = False
+        global _WORKING_COMBO
+        with _COMBO_LOCK:
+            cached_combo = _WORKING_COMBO
+        if cached_combo:
+            key_type, iteration_name = cached_combo
+            api_key = prediction_key if key_type == 'Prediction-Key' else training_key
+            if api_key:
+                headers = {
+                    key_type: api_key,
+                    'Content-Type': 'application/octet-stream',
+                    # Azure will gzip/brotli the JSON body; requests inflates it
+                    'Accept-Encoding': 'gzip, br'
+                }
+                prediction_url = f"{prediction_endpoint}/customvision/v3.0/Prediction/{project_id}/classify/iterations/{iteration_name}/image"
+                try:
+                    upload_stream.seek(0)
+                    response = SESSION.post(prediction_url, headers=headers, data=upload_stream, timeout=REQUEST_TIMEOUT)
+                    if response.status_code == 200:
+                        successful_response = response
+                except Exception as e:
+                    # The endpoint itself is unreachable: re-probing the grid
+                    # would just re-upload the image to the same dead host
+                    logger.warning("Network error on cached iteration: %s", e)
+                    give_up = True
+            if not successful_response:
+                # Iteration may have been republished; fall back to the probe
+                with _COMBO_LOCK:
+                    _WORKING_COMBO = None
+
+        # Try with Prediction Key first, then Training Key as fallback;
+        # missing keys are dropped here instead of skipped inside the loop
+        keys_to_try = [(key_type, api_key) for key_type, api_key in [
             ('Prediction-Key', prediction_key),
             ('Training-Key', training_key)
-        ]
-        
+        ] if api_key]
+
         for key_type, api_key in keys_to_try:
-            if not api_key:
-                continue
-                
+            if successful_response or give_up:
+                break
+
             headers = {
                 key_type: api_key,
-                'Content-Type': 'application/octet-stream'
+                'Content-Type': 'application/octet-stream',
+                # Azure will gzip/brotli the JSON body; requests inflates it
+                'Accept-Encoding': 'gzip, br'
             }
-            
+
             for iteration_name in iteration_names_to_try:
                 prediction_url = f"{prediction_endpoint}/customvision/v3.0/Prediction/{project_id}/classify/iterations/{iteration_name}/image"
-                
+
                 try:
-                    response = requests.post(prediction_url, headers=headers, data=image_data, timeout=10)
-                    
+                    upload_stream.seek(0)
+                    response = SESSION.post(prediction_url, headers=headers, data=upload_stream, timeout=REQUEST_TIMEOUT)
+
                     if response.status_code == 200:
-                        print(f"Prediction successful with {iteration_name}")
+                        logger.debug("Prediction successful with %s", iteration_name)
                         successful_response = response
+                        with _COMBO_LOCK:
+                            _WORKING_COMBO = (key_type, iteration_name)
                         break
-                    # Only log if not the expected first attempt
-                    elif response.status_code != 200 and iteration_name == published_name:
-                        print(f"Primary iteration failed: {response.status_code}")
+                    elif response.status_code == 404:
+                        # Iteration name doesn't exist; try the next candidate
+                        if iteration_name == published_name:
+                            logger.debug("Primary iteration failed: %s", response.status_code)
                         continue
+                    elif response.status_code in (401, 403):
+                        # Wrong key for this resource; switch keys, not names
+                        break
                     else:
-                        continue
-                        
+                        # Transient errors were already retried by the adapter;
+                        # re-uploading to every alternate name won't help
+                        logger.warning("Prediction failed: %s", response.status_code)
+                        give_up = True
+                        break
+
                 except Exception as e:
-                    # Only log network errors for primary iteration
-                    if iteration_name == published_name:
-                        print(f"Network error: {e}")
-                    continue
-            
-            # If we found a working response, break out of key loop too        
+                    # Timeouts/connection errors: the adapter already retried
+                    # with backoff, so don't amplify the hiccup across names
+                    logger.warning("Network error: %s", e)
+                    give_up = True
+                    break
+
+            # If we found a working response, break out of key loop too
             if successful_response:
                 break
         
@@ -160,30 +434,32 @@ def run_prediction(image):
             if 'predictions' in prediction_result:
                 predictions = prediction_result['predictions']
                 
-                # Sort by probability (highest first)
-                predictions.sort(key=lambda x: x['probability'], reverse=True)
-                
-                # Only process the highest confidence prediction for recommendations
-                highest_confidence_pred = None
+                # Only the handful of confident entries matter downstream:
+                # top-5 by probability without sorting the whole list, with a
+                # C-level key function instead of a lambda
+                predictions = heapq.nlargest(5, predictions, key=itemgetter('probability'))
                 
+                # Single pass: lower each tag once and look the recommendation
+                # template up in the constant dict
                 for pred in predictions:
-                    if pred['probability'] > 0.5:  # Only include predictions with >50% confidence
-                        is_recyclable = pred['tagName'].lower() == 'recyclable'
-                        
-                        detected_items.append({
-                            'type': pred['tagName'].lower(),
-                            'confidence': pred['probability'],
-                            'recyclable': is_recyclable
-                        })
-                        
-                        # Only set recommendation for the highest confidence prediction
-                        if highest_confidence_pred is None:
-                            highest_confidence_pred = pred
-                            # Generate recommendation based on highest confidence prediction only
-                            if is_recyclable:
-                                recommendations.append(f"{pred['tagName']} item can be placed in recycling bin")
-                            else:
-                                recommendations.append(f"{pred['tagName']} item should go in general waste")
+                    probability = pred['probability']
+                    if probability <= 0.5:  # Only include predictions with >50% confidence
+                        continue
+                    tag_name = pred['tagName']
+                    tag_lower = tag_name.lower()
+                    is_recyclable = tag_lower == 'recyclable'
+
+                    detected_items.append({
+                        'type': tag_lower,
+                        'confidence': probability,
+                        'recyclable': is_recyclable
+                    })
+
+                    # Only the highest confidence prediction (first after the
+                    # sort) gets a recommendation
+                    if not recommendations:
+                        recommendations.append(
+                            RECOMMENDATION_TEMPLATES[is_recyclable].format(tag_name))
             
             # If no high-confidence predictions, provide default response
             if not detected_items:
@@ -194,22 +470,26 @@ def run_prediction(image):
                 })
                 recommendations.append('Unable to classify item. Please check local recycling guidelines.')
             
-            # Print detected items for debugging
-            print(f"\n=== DETECTED ITEMS ===")
-            for i, item in enumerate(detected_items):
-                print(f"Item {i+1}: {item['type']} (confidence: {item['confidence']:.2%}, recyclable: {item['recyclable']})")
-            print(f"\n=== RECOMMENDATIONS ===")
-            for j, rec in enumerate(recommendations):
-                print(f"{j+1}. {rec}")
-            print(f"\n=== RAW PREDICTIONS ===")
-            for k, pred in enumerate(prediction_result.get('predictions', [])):
-                print(f"Prediction {k+1}: {pred.get('tagName')} - {pred.get('probability'):.2%}")
+            # Dump detected items for debugging; the isEnabledFor guard skips
+            # all the formatting work when DEBUG logging is off
+            if logger.isEnabledFor(logging.DEBUG):
+                for i, item in enumerate(detected_items):
+                    logger.debug("Item %d: %s (confidence: %.2f%%, recyclable: %s)",
+                                 i + 1, item['type'], item['confidence'] * 100, item['recyclable'])
+                for j, rec in enumerate(recommendations):
+                    logger.debug("Recommendation %d: %s", j + 1, rec)
+                for k, pred in enumerate(prediction_result.get('predictions', [])):
+                    logger.debug("Prediction %d: %s - %.2f%%",
+                                 k + 1, pred.get('tagName'), pred.get('probability') * 100)
             
-            return {
+            result = {
                 'detected_items': detected_items,
                 'recommendations': recommendations,
                 'raw_predictions': prediction_result.get('predictions', [])
             }
+            # Only successful classifications are cached; errors stay uncached
+            _cache_put(image_digest, result)
+            return result
         else:
             # If no iteration worked, return helpful error
             return {
@@ -234,9 +514,33 @@ def predict_image():
     if image.filename == '':
         return jsonify({'error': 'No image selected'}), 400
     
-    result = run_prediction(image)
+    # Hand the Azure round-trip to the bounded worker pool and wait on the
+    # future; the request thread is released if the backend wedges
+    future = _AZURE_POOL.submit(run_prediction, image)
+    try:
+        result = future.result(timeout=30)
+    except FutureTimeout:
+        return jsonify({'error': 'Prediction timed out'}), 504
     return jsonify(result)
 
+@app.route('/predict_batch', methods=['POST'])
+def predict_batch():
+    """Classify several images in one request; results keep upload order."""
+    images = [img for img in request.files.getlist('images') if img.filename != '']
+    if not images:
+        return jsonify({'error': 'No images uploaded'}), 400
+
+    # Fan out over the shared pool so the N Azure round-trips overlap instead
+    # of paying N sequential client<->server<->Azure hops
+    futures = [_AZURE_POOL.submit(run_prediction, img) for img in images]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result(timeout=30))
+        except FutureTimeout:
+            results.append({'error': 'Prediction timed out'})
+    return jsonify(results)
+
 def test_prediction_endpoint(image_path):
     """Test the /predict endpoint with a local image file."""
     try:
@@ -248,12 +552,23 @@ def test_prediction_endpoint(image_path):
         # Prepare the test request
         url = 'http://localhost:5000/predict'
         with open(image_path, 'rb') as image_file:
+            # Hash straight off the file object (kernel page cache, nothing
+            # materialized) so a run can be matched against the server-side
+            # content-hash cache; file_digest needs Python 3.11+
+            if hasattr(hashlib, 'file_digest'):
+                digest = hashlib.file_digest(image_file, 'blake2b')
+            else:
+                digest = hashlib.blake2b()
+                for block in iter(lambda: image_file.read(65536), b''):
+                    digest.update(block)
+            print(f"Image digest (blake2b): {digest.hexdigest()[:16]}")
+            image_file.seek(0)
             files = {'image': image_file}
-            
+
             print(f"Testing prediction with image: {image_path}")
             print("Sending request to http://localhost:5000/predict...")
             
-            response = requests.post(url, files=files, timeout=30)
+            response = SESSION.post(url, files=files, timeout=30)
             
             if response.status_code == 200:
                 result = response.json()
@@ -280,8 +595,11 @@ if __name__ == '__main__':
         print("Press Ctrl+C to stop the server")
         print("=" * 50)
         
-        # Start the server with host='0.0.0.0' for web service compatibility
-        app.run(debug=True, host='0.0.0.0', port=5000)
+        # Start the server with host='0.0.0.0' for web service compatibility.
+        # Debug (reloader + debugger) only when explicitly requested; threaded
+        # so concurrent /predict calls aren't serialized behind one worker.
+        debug = os.getenv('FLASK_DEBUG', '0') == '1'
+        app.run(debug=debug, host='0.0.0.0', port=5000, threaded=True)
     else:
         # Test mode - send an image to the server
         image_path = sys.argv[1]
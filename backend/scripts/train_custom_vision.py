@@ -15,21 +15,26 @@ Places to put images:
 
 This script uses the Azure Custom Vision Training SDK (azure-cognitiveservices-vision-customvision).
 """
+import hashlib
+import io
+import json
+import mmap
 import os
+import queue
+import random
 import sys
+import threading
 import time
 import requests
-from dotenv import load_dotenv
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List
+from PIL import Image
 
-env_path = Path(__file__).resolve().parent.parent / ".env"
-print("Looking for .env at:", env_path)
-load_dotenv(dotenv_path=env_path)
+from config import get_config
 
+cfg = get_config()
 
-print("Testing endpoint connectivity...")
-print(requests.get(os.getenv("ENDPOINT")).status_code)
 try:
     from azure.cognitiveservices.vision.customvision.training import CustomVisionTrainingClient
     from msrest.authentication import ApiKeyCredentials
@@ -39,25 +44,416 @@ except Exception as e:
     raise
 
 
-def collect_images(folder: Path) -> List[ImageFileCreateEntry]:
-    entries = []
-    for f in folder.glob('*'):
-        if f.is_file():
-            with open(f, 'rb') as fh:
-                data = fh.read()
-            entries.append(ImageFileCreateEntry(name=f.name, contents=data))
-    return entries
+# One listing per directory per run: the min-images filter, count logging,
+# and the upload batcher all consult the same cached list instead of
+# re-walking the data tree
+_dir_cache = {}
 
 
-print("ENDPOINT from env:", os.getenv("ENDPOINT"))
-print("TRAINING_KEY from env:", os.getenv("TRAINING_KEY"))
-print("PREDICTION_RESOURCE_ID from env:", os.getenv("PREDICTION_RESOURCE_ID"))
+def list_files(folder: Path):
+    """Return the files directly under folder, cached for the process."""
+    folder = Path(folder)
+    cached = _dir_cache.get(folder)
+    if cached is None:
+        # scandir gets is_file() from readdir's d_type, so enumerating a
+        # folder of tens of thousands of images doesn't stat each one.
+        # Hidden entries (the listing manifest, the .optimized cache) are
+        # bookkeeping, not training data.
+        with os.scandir(folder) as it:
+            cached = _dir_cache[folder] = [Path(e.path) for e in it
+                                           if e.is_file() and not e.name.startswith('.')]
+    return cached
+
+
+_MANIFEST_NAME = '.filelist.txt'
+
+# Content-hash record of what already made it to the service, so iterative
+# re-runs only upload new or changed images
+_UPLOADED_NAME = '.uploaded.json'
+_upload_manifest = {}
+_upload_manifest_path = None
+_upload_manifest_lock = threading.Lock()
+
+
+def load_upload_manifest(data_dir: Path):
+    """Load data_dir/.uploaded.json, mapping content digest -> upload record."""
+    global _upload_manifest_path
+    _upload_manifest_path = data_dir / _UPLOADED_NAME
+    try:
+        _upload_manifest.update(json.loads(_upload_manifest_path.read_text()))
+    except (OSError, ValueError):
+        pass  # first run, or an unreadable manifest; start empty
+
+
+def already_uploaded(digest, project_id, tag_id):
+    """True when these exact bytes were uploaded to this project under this tag."""
+    record = _upload_manifest.get(digest)
+    return bool(record
+                and record.get('project_id') == str(project_id)
+                and record.get('tag_id') == str(tag_id))
+
+
+def record_uploaded(entries, project_id):
+    """Mark entries (carrying their content digest) as uploaded."""
+    now = time.time()
+    with _upload_manifest_lock:
+        for e in entries:
+            digest = getattr(e, '_digest', None)
+            if digest:
+                _upload_manifest[digest] = {
+                    'project_id': str(project_id),
+                    'tag_id': str(e.tag_ids[0]) if e.tag_ids else None,
+                    'uploaded_at': now,
+                }
+
+
+def save_upload_manifest():
+    """Persist the upload record next to the data it describes."""
+    if _upload_manifest_path is None:
+        return
+    try:
+        _upload_manifest_path.write_text(json.dumps(_upload_manifest))
+    except OSError as e:
+        print(f'Could not write upload manifest: {e}')
+
+
+def load_listing_manifest(data_dir: Path) -> bool:
+    """Warm the listing cache from data_dir/.filelist.txt when still fresh.
+
+    The manifest holds one path per line relative to data_dir. It is only
+    trusted while it's newer than every directory it covers, so adding or
+    removing images invalidates it and the tree gets rescanned.
+    """
+    manifest = data_dir / _MANIFEST_NAME
+    try:
+        manifest_mtime = manifest.stat().st_mtime
+    except OSError:
+        return False
+    by_dir = {}
+    for line in manifest.read_text().splitlines():
+        if line:
+            p = data_dir / line
+            by_dir.setdefault(p.parent, []).append(p)
+    try:
+        if any(d.stat().st_mtime > manifest_mtime for d in by_dir):
+            return False
+    except OSError:
+        return False
+    _dir_cache.update(by_dir)
+    return True
+
+
+def save_listing_manifest(data_dir: Path):
+    """Persist every cached listing under data_dir so the next run skips the walk."""
+    lines = []
+    for folder, paths in _dir_cache.items():
+        try:
+            folder.relative_to(data_dir)
+        except ValueError:
+            continue  # listing from outside the data tree
+        lines.extend(str(p.relative_to(data_dir)) for p in paths
+                     if not p.name.startswith('.'))
+    try:
+        (data_dir / _MANIFEST_NAME).write_text('\n'.join(lines) + '\n')
+    except OSError as e:
+        print(f'Could not write listing manifest: {e}')
+
+
+def list_dirs(folder: Path):
+    """Return the subdirectories directly under folder.
+
+    scandir's DirEntry.is_dir() answers from the directory read itself, so
+    no per-entry stat is issued the way Path.iterdir + is_dir() does.
+    """
+    with os.scandir(folder) as it:
+        return [Path(e.path) for e in it
+                if e.is_dir() and not e.name.startswith('.')]
+
+
+# Custom Vision resizes images internally anyway, so anything bigger than
+# this only costs upload bandwidth
+_MAX_EDGE = 1024
+_JPEG_QUALITY = 85
+
+
+def optimize_jpeg_bytes(path: Path) -> bytes:
+    """Losslessly recompress one JPEG: drop metadata, optimized Huffman tables.
+
+    quality='keep' reuses the source quantization tables, so pixels are
+    untouched while typical camera JPEGs shed 10-30% of their bytes.
+    """
+    data = path.read_bytes()
+    try:
+        img = Image.open(io.BytesIO(data))
+        if img.format != 'JPEG':
+            return data
+        buf = io.BytesIO()
+        img.save(buf, 'JPEG', quality='keep', optimize=True, progressive=True)
+        out = buf.getvalue()
+        return out if len(out) < len(data) else data
+    except (OSError, ValueError):
+        return data
+
+
+def optimize_folder_jpegs(folder: Path):
+    """Recompress a folder's JPEGs into folder/.optimized across all cores.
+
+    Entries already fresher than their source are skipped, so re-runs only
+    pay for new or changed images. The cache lives in a subdirectory, which
+    the flat file listings never pick up as uploadable images.
+    """
+    cache_dir = folder / '.optimized'
+    cache_dir.mkdir(exist_ok=True)
+    todo = [(p, cache_dir / p.name) for p in list_files(folder)
+            if not (cache_dir / p.name).exists()
+            or (cache_dir / p.name).stat().st_mtime < p.stat().st_mtime]
+    if not todo:
+        return
+    print(f'Optimizing {len(todo)} JPEGs under {folder}...')
+    with ProcessPoolExecutor() as ex:
+        for (_, out), data in zip(todo, ex.map(optimize_jpeg_bytes, [p for p, _ in todo])):
+            out.write_bytes(data)
+
+
+def load_image_bytes(path: Path) -> bytes:
+    """Read one image, downscaled to a <=1024px JPEG when oversized.
+
+    Phone-camera shots shrink 4-10x this way, and upload bandwidth is what
+    dominates training-setup wall time.
+    """
+    # Prefer the losslessly optimized copy when --optimize-jpeg produced one
+    optimized = path.parent / '.optimized' / path.name
+    if optimized.exists():
+        path = optimized
+    # Map the file instead of read(): one copy straight out of the page
+    # cache rather than a kernel buffer copy plus a Python heap copy
+    with open(path, 'rb') as fh:
+        try:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                data = bytes(mm)
+        except ValueError:  # zero-length files can't be mapped
+            data = fh.read()
+    try:
+        img = Image.open(io.BytesIO(data))
+        if max(img.size) <= _MAX_EDGE:
+            return data
+        img.thumbnail((_MAX_EDGE, _MAX_EDGE), Image.LANCZOS)
+        buf = io.BytesIO()
+        img.convert('RGB').save(buf, 'JPEG', quality=_JPEG_QUALITY, optimize=True)
+        return buf.getvalue()
+    except (OSError, ValueError):
+        # Not decodable locally; send as-is and let the service report it
+        return data
+
+
+def pack_batches(entries, max_bytes=48 * 1024 * 1024, max_count=64):
+    """Greedily pack entries into batches under both byte and count limits.
+
+    Custom Vision caps request bodies at 64MB. A fixed 64-image batch
+    overshoots that on 4K photos and wastes the pipeline on thumbnails;
+    packing against a 48MB budget keeps multipart overhead clear of the
+    limit while small images still fill out full-count batches.
+    """
+    batch, batch_bytes = [], 0
+    for entry in entries:
+        size = len(entry.contents)
+        if batch and (len(batch) >= max_count or batch_bytes + size > max_bytes):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(entry)
+        batch_bytes += size
+    if batch:
+        yield batch
+
+
+def iter_image_entries(folder: Path, tag_id=None, project_id=None, read_chunk=64):
+    """Yield ready-to-send ImageFileCreateEntry objects one at a time.
+
+    Files are read read_chunk at a time through a thread pool, so only a
+    bounded window of image bytes is resident while downstream consumes.
+    The listing comes from the process-wide cache, so callers that already
+    counted the folder don't trigger a second walk. Bytes whose digest is
+    already in the upload manifest for this project and tag are skipped.
+    """
+    tag_ids = [tag_id] if tag_id else None
+    paths = list_files(folder)
+    with ThreadPoolExecutor(max_workers=16) as ex:
+        for i in range(0, len(paths), read_chunk):
+            chunk = paths[i:i + read_chunk]
+            for name, data in ex.map(lambda p: (p.name, load_image_bytes(p)), chunk):
+                digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+                if project_id and already_uploaded(digest, project_id, tag_id):
+                    continue
+                entry = ImageFileCreateEntry(name=name, contents=data, tag_ids=tag_ids)
+                entry._digest = digest
+                yield entry
+
+
+def iter_image_batches(folder: Path, batch_size: int, tag_id=None, project_id=None):
+    """Yield upload batches sized by both image count and total bytes."""
+    yield from pack_batches(iter_image_entries(folder, tag_id, project_id),
+                            max_count=batch_size)
+
+
+def upload_with_retry(trainer, project_id, batch, label, attempts=3):
+    """Upload one batch, retrying failed images in smaller sub-batches.
+
+    Transient 429/5xx answers surface as per-image failure statuses or
+    raised errors; instead of dropping those images from the training set,
+    they are resubmitted in halved sub-batches with jittered exponential
+    backoff, so one bad image or throttled moment doesn't keep poisoning a
+    whole request. Images still failing after the last attempt are printed.
+    """
+    pending = list(batch)
+    delay = 1.0
+    for attempt in range(attempts):
+        still_failed = []
+        size = max(1, len(pending) // 2) if attempt else len(pending)
+        for i in range(0, len(pending), size):
+            sub = pending[i:i + size]
+            try:
+                result = trainer.create_images_from_files(
+                    project_id, ImageFileCreateBatch(images=sub))
+            except Exception as e:
+                print(f'  Upload error for {label} (attempt {attempt + 1}): {e}')
+                still_failed.extend(sub)
+                continue
+            if result.is_batch_successful:
+                record_uploaded(sub, project_id)
+            else:
+                succeeded = []
+                for entry, img_result in zip(sub, result.images):
+                    if img_result.status not in ('OK', 'OKDuplicate'):
+                        still_failed.append(entry)
+                    else:
+                        succeeded.append(entry)
+                record_uploaded(succeeded, project_id)
+        if not still_failed:
+            return
+        pending = still_failed
+        if attempt < attempts - 1:
+            time.sleep(delay + random.uniform(0, 1))
+            delay = min(delay * 2, 30)
+    for entry in pending:
+        print(f'Failed image after {attempts} attempts: {entry.name} ({label})')
+
+
+def upload_in_batches(trainer, project_id, folders, tag_id, batch_size, max_workers, label,
+                      optimize=False):
+    """Upload every image under folders with tag_id through a bounded pool.
+
+    Both upload sites share this path, so connection pooling, batching,
+    retries, and failure reporting only need tuning in one place. In-flight
+    batches are bounded at max_workers so memory stays a handful of batches
+    deep.
+    """
+    if optimize:
+        for folder in folders:
+            optimize_folder_jpegs(folder)
+
+    # Producer/consumer split: a reader thread keeps filling batches while
+    # uploader workers drain them, so disk I/O overlaps network I/O and the
+    # wall clock tends to max(read, upload) instead of their sum. The queue
+    # bound caps staging at ~2 extra batches of image bytes.
+    batches = queue.Queue(maxsize=2)
+    done = object()
+
+    def _reader():
+        try:
+            for folder in folders:
+                for batch in iter_image_batches(folder, batch_size, tag_id=tag_id,
+                                                project_id=project_id):
+                    batches.put(batch)
+        finally:
+            batches.put(done)
+
+    reader = threading.Thread(target=_reader, name=f'read-{label}', daemon=True)
+    reader.start()
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futures = []
+        while True:
+            batch = batches.get()
+            if batch is done:
+                break
+            futures.append(ex.submit(upload_with_retry, trainer, project_id, batch, label))
+            while len(futures) >= max_workers:
+                futures.pop(0).result()
+        for future in futures:
+            future.result()
+    reader.join()
+
+
+def upload_batches_via_blob(trainer, project_id, folder, tag_id, batch_size, max_connections, label):
+    """Stage a folder's images in Blob Storage and register them by URL.
+
+    Blob upload does parallel block PUTs per file and Custom Vision then
+    pulls the images from storage server-side, so the bytes skip the
+    training client's single-request body framing. Returns False (without
+    uploading anything) when the storage SDK or connection string is
+    missing, so the caller can fall back to the direct path.
+    """
+    try:
+        from azure.storage.blob import BlobServiceClient, BlobSasPermissions, generate_blob_sas
+    except ImportError:
+        print('--upload-via-blob needs the azure-storage-blob package; falling back to direct upload')
+        return False
+    from azure.cognitiveservices.vision.customvision.training.models import (
+        ImageUrlCreateEntry, ImageUrlCreateBatch)
+
+    conn = os.getenv('AZURE_STORAGE_CONNECTION_STRING')
+    container = os.getenv('AZURE_STORAGE_CONTAINER', 'trashvision-staging')
+    if not conn:
+        print('AZURE_STORAGE_CONNECTION_STRING not set; falling back to direct upload')
+        return False
+
+    service = BlobServiceClient.from_connection_string(conn)
+    try:
+        service.create_container(container)
+    except Exception:
+        pass  # already exists
+    container_client = service.get_container_client(container)
+
+    def _stage(path):
+        blob = container_client.get_blob_client(f'{label}/{path.name}')
+        with open(path, 'rb') as fh:
+            blob.upload_blob(fh, overwrite=True, max_concurrency=max_connections)
+        sas = generate_blob_sas(
+            account_name=service.account_name,
+            container_name=container,
+            blob_name=blob.blob_name,
+            account_key=service.credential.account_key,
+            permission=BlobSasPermissions(read=True),
+            expiry=datetime.utcnow() + timedelta(hours=4),
+        )
+        return f'{blob.url}?{sas}'
+
+    paths = list_files(folder)
+    print(f'Staging {len(paths)} images for {label} in blob container {container}...')
+    with ThreadPoolExecutor(max_workers=max_connections) as ex:
+        urls = list(ex.map(_stage, paths))
+
+    for i in range(0, len(urls), batch_size):
+        batch = [ImageUrlCreateEntry(url=u, tag_ids=[tag_id]) for u in urls[i:i + batch_size]]
+        report_upload_failures(
+            trainer.create_images_from_urls(project_id, ImageUrlCreateBatch(images=batch)),
+            label)
+    return True
+
+
+def report_upload_failures(upload_result, label):
+    """Print per-image failures from one create_images_from_files result."""
+    if not upload_result.is_batch_successful:
+        print(f'  Some images failed to upload in batch for {label}:')
+        for img_result in upload_result.images:
+            if img_result.status != "OK":
+                print(f"Failed image: {img_result.source_url}, status: {img_result.status}")
 
 
 def main():
-    endpoint = os.getenv('ENDPOINT')
-    key = os.getenv('TRAINING_KEY')
-    prediction_resource_id = os.getenv('PREDICTION_RESOURCE_ID')
+    # config.py handles the short vs fully-qualified env name fallbacks
+    endpoint = cfg.endpoint
+    key = cfg.training_key
+    prediction_resource_id = cfg.prediction_resource_id
 
     if not endpoint or not key:
         print('Please set ENDPOINT and TRAINING_KEY in the environment.')
@@ -73,17 +469,37 @@ def main():
     parser.add_argument('--dry-run', action='store_true', help='List files and tags that would be uploaded without calling the API')
     parser.add_argument('--min-images', type=int, default=8, help='Minimum images required per recyclable subfolder to include it in training')
     parser.add_argument('--batch-size', type=int, default=64, help='Number of images to send per upload batch')
+    parser.add_argument('--max-connections', type=int, default=8, help='Concurrent upload batches in flight')
+    parser.add_argument('--check-endpoint', action='store_true', help='Verify the training endpoint is reachable before doing anything else')
+    parser.add_argument('--upload-via-blob', action='store_true', help='Stage images in Azure Blob Storage and register them by URL (needs azure-storage-blob and AZURE_STORAGE_CONNECTION_STRING)')
+    parser.add_argument('--optimize-jpeg', action='store_true', help='Losslessly recompress JPEGs (metadata stripped, optimized tables) before upload')
 
     parser.add_argument('--data-dir', default=os.path.join('backend', 'data'))
     args = parser.parse_args()
 
-    # Find or create project
-    projects = trainer.get_projects()
+    # Opt-in sanity check; a HEAD with a short timeout, not an unguarded GET
+    # at import time that stalled --help and --dry-run on flaky networks
+    if args.check_endpoint:
+        try:
+            status = requests.head(endpoint, timeout=5).status_code
+            print(f'Endpoint reachable: {endpoint} -> {status}')
+        except requests.RequestException as e:
+            print(f'Endpoint check failed for {endpoint}: {e}')
+            sys.exit(1)
+
+    # Find or create project; a cached PROJECT_ID skips listing every
+    # project in the resource
     project = None
-    for p in projects:
-        if p.name == args.project_name:
-            project = p
-            break
+    if cfg.project_id:
+        try:
+            project = trainer.get_project(cfg.project_id)
+        except Exception:
+            project = None  # stale id; fall through to the name scan
+    if not project:
+        for p in trainer.get_projects():
+            if p.name == args.project_name:
+                project = p
+                break
     if not project:
         print(f'Creating project {args.project_name}')
         project = trainer.create_project(args.project_name)
@@ -104,6 +520,12 @@ def main():
     recyclable_dir = data_dir / 'Recyclable'
     nonrecyc_dir = data_dir / 'Nonrecyclable'
 
+    # Between iterative training runs the data tree rarely changes; a fresh
+    # manifest replaces the whole O(N files) rescan with one file read
+    if load_listing_manifest(data_dir):
+        print('Loaded directory listings from', _MANIFEST_NAME)
+    load_upload_manifest(data_dir)
+
     # Debug: print resolved paths and immediate subfolders to ensure we're scanning the right location
     try:
         print('Resolved data_dir:', str(data_dir.resolve()))
@@ -111,39 +533,49 @@ def main():
         print('Resolved data_dir: <unable to resolve>')
     print('Looking for recyclable_dir at:', str(recyclable_dir))
     print('Looking for nonrecyc_dir at:', str(nonrecyc_dir))
-    top_folders = [p for p in data_dir.iterdir() if p.is_dir()]
+    top_folders = list_dirs(data_dir)
     print('Immediate subfolders under data_dir:', [p.name for p in top_folders])
 
     # Get existing tags once (map by lowercase name)
     existing_tags = {t.name.lower(): t for t in trainer.get_tags(project.id)}
 
     # --- Clean up old tags not present in current folders ---
-    current_tag_names = [p.name.lower() for p in recyclable_dir.iterdir() if p.is_dir()] + ['nonrecyclable']
-    for t in list(existing_tags.values()):
-        if t.name.lower() not in current_tag_names:
-            print(f"Deleting old tag: {t.name}")
+    current_tag_names = [p.name.lower() for p in list_dirs(recyclable_dir)] + ['nonrecyclable']
+    orphans = [t for t in existing_tags.values() if t.name.lower() not in current_tag_names]
+    if orphans:
+        def _safe_delete(tag):
             try:
-                trainer.delete_tag(project.id, t.id)
-                del existing_tags[t.name.lower()]
+                trainer.delete_tag(project.id, tag.id)
+                return tag, None
             except Exception as e:
-                print(f"  Could not delete tag {t.name}: {e}")
+                return tag, e
+
+        # Each delete is a full HTTPS round-trip; overlapping them makes the
+        # cleanup cost ~one round-trip instead of one per orphan tag
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            for tag, error in ex.map(_safe_delete, orphans):
+                if error:
+                    print(f"  Could not delete tag {tag.name}: {error}")
+                else:
+                    print(f"Deleted old tag: {tag.name}")
+                    del existing_tags[tag.name.lower()]
 
 
     material_tags = {}
     handled_nonrecyclable = False
 
     def count_files(folder: Path) -> int:
-        return sum(1 for f in folder.iterdir() if f.is_file())
+        return len(list_files(folder))
 
     # 1) Prefer Recyclable subfolders if present and meet min_images
     recyclable_material_dirs = []
     if recyclable_dir.exists():
-        for p in recyclable_dir.iterdir():
-            if p.is_dir():
-                if count_files(p) >= args.min_images:
-                    recyclable_material_dirs.append(p)
-                else:
-                    print(f'Found recyclable subfolder {p.name} but only {count_files(p)} files (< {args.min_images}); will skip')
+        for p in list_dirs(recyclable_dir):
+            n = count_files(p)
+            if n >= args.min_images:
+                recyclable_material_dirs.append(p)
+            else:
+                print(f'Found recyclable subfolder {p.name} but only {n} files (< {args.min_images}); will skip')
 
     if recyclable_material_dirs:
         print('Processing recyclable subfolders:')
@@ -152,6 +584,7 @@ def main():
             tag = existing_tags.get(tag_name.lower())
             if not tag:
                 tag = trainer.create_tag(project.id, tag_name)
+                existing_tags[tag_name.lower()] = tag
                 print(f'Created tag for recyclable item: {tag_name}')
             else:
                 print(f'Using existing tag for recyclable item: {tag_name}')
@@ -159,7 +592,7 @@ def main():
     else:
         # 2) No recyclable subfolders found (or none with enough images) -> try Nonrecyclable
         if nonrecyc_dir.exists():
-            non_subfolders = [p for p in nonrecyc_dir.iterdir() if p.is_dir() and count_files(p) >= args.min_images]
+            non_subfolders = [p for p in list_dirs(nonrecyc_dir) if count_files(p) >= args.min_images]
             if non_subfolders:
                 print('No recyclable categories found; processing Nonrecyclable subfolders as tags:')
                 for mdir in non_subfolders:
@@ -167,6 +600,7 @@ def main():
                     tag = existing_tags.get(tag_name.lower())
                     if not tag:
                         tag = trainer.create_tag(project.id, tag_name)
+                        existing_tags[tag_name.lower()] = tag
                         print(f'Created tag for nonrecyclable item: {tag_name}')
                     else:
                         print(f'Using existing tag for nonrecyclable item: {tag_name}')
@@ -176,13 +610,14 @@ def main():
                 # 3) No nonrecyclable subfolders with enough images; if there are files directly under Nonrecyclable, upload them under single tag
                 direct_files = []
                 if nonrecyc_dir.exists():
-                    direct_files = [f for f in nonrecyc_dir.iterdir() if f.is_file()]
+                    direct_files = list_files(nonrecyc_dir)
                 if direct_files:
                     print('No recyclable categories found and no nonrecyclable subcategories; will upload direct Nonrecyclable files under single tag')
                     # ensure tag exists
                     nonrecyc_tag = existing_tags.get('nonrecyclable')
                     if not nonrecyc_tag:
                         nonrecyc_tag = trainer.create_tag(project.id, 'Nonrecyclable')
+                        existing_tags['nonrecyclable'] = nonrecyc_tag
                         print('Created tag Nonrecyclable')
                     material_tags[nonrecyc_dir] = nonrecyc_tag
                     handled_nonrecyclable = True
@@ -193,86 +628,94 @@ def main():
                     nonrecyc_tag = existing_tags.get('nonrecyclable')
                     if not nonrecyc_tag:
                         nonrecyc_tag = trainer.create_tag(project.id, 'Nonrecyclable')
+                        existing_tags['nonrecyclable'] = nonrecyc_tag
                         print('Created tag Nonrecyclable')
                     # create a virtual 'all_data' entry representing the folder
                     material_tags[data_dir] = nonrecyc_tag
                     handled_nonrecyclable = True
 
     BATCH = args.batch_size
+    POOL = args.max_connections
     # Upload images per material tag
     for mdir, tag in material_tags.items():
-        entries = collect_images(mdir)
-        print(f'Found {len(entries)} images for recyclable item {mdir.name} (min required: {args.min_images})')
-        if len(entries) < args.min_images:
-            print(f'  Skipping {mdir.name}: only {len(entries)} images (below min {args.min_images})')
+        # Cheap listing first: the min-images/dry-run decisions don't need to
+        # read a single image byte. Recyclable subfolders were already
+        # filtered above, but the Nonrecyclable/fallback branches feed
+        # unfiltered dirs in here, so the threshold still applies (against
+        # the cached listing, so it's free).
+        paths = list_files(mdir)
+        n = len(paths)
+        print(f'Found {n} images for recyclable item {mdir.name} (min required: {args.min_images})')
+        if n < args.min_images:
+            print(f'  Skipping {mdir.name}: only {n} images (below min {args.min_images})')
             continue
-        batch_entries = []
-        for e in entries:
-            e.tag_ids = [tag.id]
-            batch_entries.append(e)
         if args.dry_run:
-            print(f'  Dry-run: would upload {len(batch_entries)} images for {mdir.name} with tag id {tag.id}')
+            print(f'  Dry-run: would upload {n} images for {mdir.name} with tag id {tag.id}')
             # print sample filenames
-            sample = [b.name for b in batch_entries[:5]]
+            sample = [p.name for p in paths[:5]]
             print('   Sample files:', sample)
             continue
+        if args.upload_via_blob and upload_batches_via_blob(
+                trainer, project.id, mdir, tag.id, BATCH, POOL, mdir.name):
+            continue
         print(f'Uploading images for recyclable item {mdir.name} in batches of {BATCH}...')
-        for i in range(0, len(batch_entries), BATCH):
-            batch = batch_entries[i:i+BATCH]
-            images = ImageFileCreateBatch(images=batch)
-            upload_result = trainer.create_images_from_files(project.id, images)
-            # upload_result contains per-image status; print detailed info on failures
-            if not upload_result.is_batch_successful:
-                print(f'  Some images failed to upload in batch for {mdir.name}:')
-                for img_result in upload_result.images:
-                    if img_result.status != "OK":
-                        print(f"Failed image: {img_result.source_url}, status: {img_result.status}")
+        # Azure tolerates several in-flight batches; the shared helper
+        # amortizes the round-trip latency across pool workers while the
+        # streaming batcher keeps only the in-flight batches in memory
+        upload_in_batches(trainer, project.id, [mdir], tag.id, BATCH, POOL, mdir.name,
+                          optimize=args.optimize_jpeg)
 
     # --- Nonrecyclable: collect all images under Nonrecyclable/* and tag them as a single Nonrecyclable tag ---
     nonrecyc_tag = existing_tags.get('nonrecyclable')
     if not nonrecyc_tag:
         nonrecyc_tag = trainer.create_tag(project.id, 'Nonrecyclable')
+        existing_tags['nonrecyclable'] = nonrecyc_tag
         print('Created tag Nonrecyclable')
 
-    non_entries = []
+    # Folders whose images get the single Nonrecyclable tag; listing only, no
+    # bytes are read until upload time. The old walk broke out on the first
+    # loose file, silently dropping any subfolder sorted after it.
+    non_sources = []
     if nonrecyc_dir.exists():
-        for p in nonrecyc_dir.iterdir():
-            if p.is_dir():
-                non_entries.extend(collect_images(p))
-            elif p.is_file():
-                # also include files directly under Nonrecyclable/
-                non_entries.extend(collect_images(nonrecyc_dir))
-                break
+        non_sources = list_dirs(nonrecyc_dir)
+        if list_files(nonrecyc_dir):
+            # files directly under Nonrecyclable/ upload via its flat listing
+            non_sources.append(nonrecyc_dir)
     else:
         print('Warning: Nonrecyclable directory not found at', nonrecyc_dir)
 
-    print(f'Found {len(non_entries)} nonrecyclable images')
-    if non_entries:
-        batch_entries = []
-        for e in non_entries:
-            e.tag_ids = [nonrecyc_tag.id]
-            batch_entries.append(e)
+    non_count = sum(len(list_files(src)) for src in non_sources)
+    print(f'Found {non_count} nonrecyclable images')
+    if non_count:
         if args.dry_run:
-            print(f'  Dry-run: would upload {len(batch_entries)} nonrecyclable images with tag id {nonrecyc_tag.id}')
+            print(f'  Dry-run: would upload {non_count} nonrecyclable images with tag id {nonrecyc_tag.id}')
+        elif args.upload_via_blob and all(
+                upload_batches_via_blob(trainer, project.id, src, nonrecyc_tag.id,
+                                        BATCH, POOL, 'Nonrecyclable')
+                for src in non_sources):
+            pass
         else:
             print('Uploading Nonrecyclable images in batches of', BATCH)
-            for i in range(0, len(batch_entries), BATCH):
-                batch = batch_entries[i:i+BATCH]
-                images = ImageFileCreateBatch(images=batch)
-                upload_result = trainer.create_images_from_files(project.id, images)
-                if not upload_result.is_batch_successful:
-                    print('  Some images failed to upload in Nonrecyclable batch:')
-                    for img_result in getattr(upload_result, 'images', []):
-                        if not getattr(img_result, 'status', True):
-                            print('    Failed:', getattr(img_result, 'source_picture', getattr(img_result, 'image', getattr(img_result, 'file_name', '<unknown>'))))
+            upload_in_batches(trainer, project.id, non_sources, nonrecyc_tag.id,
+                              BATCH, POOL, 'Nonrecyclable', optimize=args.optimize_jpeg)
 
+    # Everything that needed a listing has run; persist both caches for the
+    # next run (what's on disk, and what's already on the service)
+    save_listing_manifest(data_dir)
+    save_upload_manifest()
 
     # Train
     print('Training project...')
-    tags = trainer.get_tags(project.id)
-    for t in tags:
-        images = trainer.get_tagged_images(project.id, tag_ids=[t.id])
-        print(t.name, "->", len(images))
+    # existing_tags has tracked every tag created above, so no re-fetch; the
+    # per-tag counts are one lightweight call each, issued concurrently
+    # instead of pulling full image metadata tag by tag
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        count_futures = [
+            (t.name, ex.submit(trainer.get_tagged_image_count, project.id, tag_ids=[t.id]))
+            for t in existing_tags.values()
+        ]
+        for name, future in count_futures:
+            print(name, "->", future.result())
 
     try:
         iteration = trainer.train_project(project.id)
@@ -287,11 +730,19 @@ def main():
     print("Iteration ID:", iteration.id)
     print("Iteration status:", iteration.status)
 
-    # Wait for training to complete (the SDK may return when training is done but we poll status)
-    while iteration.status != 'Completed':
+    # Wait for training to complete (the SDK may return when training is done
+    # but we poll status). Back the poll interval off so a long run makes a
+    # handful of status calls instead of one every 2s; the jitter keeps
+    # parallel runs from polling in lockstep.
+    delay = 2
+    while iteration.status not in ('Completed', 'Failed'):
         print('Training status:', iteration.status)
-        time.sleep(2)
+        time.sleep(delay + random.uniform(0, 1))
+        delay = min(delay * 1.5, 60)
         iteration = trainer.get_iteration(project.id, iteration.id)
+    if iteration.status == 'Failed':
+        print('Training failed for iteration', iteration.id)
+        sys.exit(1)
     print('Training completed. Iteration id:', iteration.id)
 
     # Publish iteration if prediction resource id provided
@@ -1,3 +1,13 @@
+"""
+Entry point for the TrashVision prediction server.
+
+Development:
+python backend/start_server.py
+
+Production (WSGI callable, imported lazily per worker; fork + copy-on-write
+means the app module only pages in once):
+gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:5000 --chdir backend "start_server:get_app()"
+"""
 import os
 import sys
 
@@ -5,12 +15,24 @@ import sys
 scripts_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts')
 sys.path.insert(0, scripts_dir)
 
-# Import and run the prediction server
-from test_predict import app
+application = None
+
+
+def get_app():
+    """Import the Flask app on first use instead of at module import."""
+    global application
+    if application is None:
+        from test_predict import app
+        application = app
+    return application
+
 
 if __name__ == '__main__':
     print("Starting TrashVision Prediction Server...")
     print("Server will be available at: http://localhost:5000")
     print("Press Ctrl+C to stop the server")
-    
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+
+    # Debug (and the reloader's double-spawn) only when asked for; threaded
+    # so concurrent /predict requests overlap their Azure round-trips
+    debug = os.getenv('FLASK_DEBUG', '').lower() in ('1', 'true', 'yes')
+    get_app().run(debug=debug, host='0.0.0.0', port=5000, threaded=True)